@@ -1,4 +1,7 @@
 from __future__ import annotations
+from typing import Sequence
+
+import numpy
 
 class Descriptor:
     @property
@@ -69,6 +72,39 @@ def evaluate_function(evaluated: bytes, state: bytes) -> tuple[float, set[int]]:
 def evaluate_linear(evaluated: bytes, state: bytes) -> tuple[float, set[int]]: ...
 def evaluate_quadratic(evaluated: bytes, state: bytes) -> tuple[float, set[int]]: ...
 def evaluate_polynomial(evaluated: bytes, state: bytes) -> tuple[float, set[int]]: ...
+def evaluate_linear_dict(
+    evaluated: bytes, state: dict[int, float]
+) -> tuple[float, set[int]]: ...
+def evaluate_quadratic_dict(
+    evaluated: bytes, state: dict[int, float]
+) -> tuple[float, set[int]]: ...
+def evaluate_polynomial_dict(
+    evaluated: bytes, state: dict[int, float]
+) -> tuple[float, set[int]]: ...
+def evaluate_linear_batch(
+    evaluated: bytes, states: Sequence[dict[int, float]]
+) -> list[float]: ...
+def evaluate_quadratic_batch(
+    evaluated: bytes, states: Sequence[dict[int, float]]
+) -> list[float]: ...
+def evaluate_polynomial_batch(
+    evaluated: bytes, states: Sequence[dict[int, float]]
+) -> list[float]: ...
 def evaluate_constraint(evaluated: bytes, state: bytes) -> tuple[bytes, set[int]]: ...
 def evaluate_instance(evaluated: bytes, state: bytes) -> tuple[bytes, set[int]]: ...
+def evaluate_instance_batch(
+    evaluated: bytes, states: Sequence[dict[int, float]]
+) -> list[bytes]: ...
+def evaluate_instance_objectives(
+    evaluated: bytes, states: Sequence[dict[int, float]]
+) -> tuple[list[float], list[bool]]: ...
 def used_decision_variable_ids(function: bytes) -> set[int]: ...
+def used_decision_variable_ids_batch(functions: Sequence[bytes]) -> list[set[int]]: ...
+def encode_linear(
+    ids: Sequence[int], coefficients: Sequence[float], constant: float
+) -> bytes: ...
+def encode_polynomial(
+    ids: Sequence[int] | numpy.ndarray,
+    offsets: Sequence[int] | numpy.ndarray,
+    coefficients: Sequence[float] | numpy.ndarray,
+) -> bytes: ...
@@ -1,8 +1,12 @@
 from __future__ import annotations
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Sequence, Mapping
+from math import nan
+import itertools
+import threading
 from datetime import datetime
 from dataclasses import dataclass, field
-from pandas import DataFrame, concat, MultiIndex
+from pandas import DataFrame, Index
+import numpy
 
 from .solution_pb2 import State, Solution as _Solution
 from .instance_pb2 import Instance as _Instance
@@ -13,7 +17,23 @@ from .linear_pb2 import Linear as _Linear
 from .constraint_pb2 import Equality, Constraint as _Constraint
 from .decision_variables_pb2 import DecisionVariable as _DecisionVariable, Bound
 
-from .._ommx_rust import evaluate_instance, used_decision_variable_ids
+from .._ommx_rust import (
+    evaluate_instance,
+    evaluate_instance_batch,
+    evaluate_instance_objectives,
+    evaluate_linear,
+    evaluate_linear_dict,
+    evaluate_linear_batch,
+    evaluate_quadratic,
+    evaluate_quadratic_dict,
+    evaluate_quadratic_batch,
+    evaluate_polynomial,
+    evaluate_polynomial_dict,
+    evaluate_polynomial_batch,
+    used_decision_variable_ids_batch,
+    encode_linear,
+    encode_polynomial,
+)
 
 
 @dataclass
@@ -74,6 +94,13 @@ class Instance:
     Arbitrary annotations stored in OMMX artifact. Use :py:attr:`title` or other specific attributes if possible.
     """
 
+    _decision_variable_index: dict[int, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _constraint_index: dict[int, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     # Re-export some enums
     MAXIMIZE = _Instance.SENSE_MAXIMIZE
     MINIMIZE = _Instance.SENSE_MINIMIZE
@@ -126,28 +153,151 @@ class Instance:
     @property
     def constraints(self) -> DataFrame:
         constraints = self.raw.constraints
-        parameters = DataFrame(dict(v.parameters) for v in constraints)
-        parameters.columns = MultiIndex.from_product(
-            [["parameters"], parameters.columns]
-        )
-        df = DataFrame(
+        return _table(
+            constraints,
             {
-                "id": c.id,
-                "equality": _equality(c.equality),
-                "type": _function_type(c.function),
-                "used_ids": used_decision_variable_ids(c.function.SerializeToString()),
-                "name": c.name,
-                "description": c.description,
-            }
-            for c in constraints
+                "equality": [_equality(c.equality) for c in constraints],
+                "type": [_function_type(c.function) for c in constraints],
+                # Decoded in Rust at once, rather than calling Rust for each constraint
+                "used_ids": used_decision_variable_ids_batch(
+                    [c.function.SerializeToString() for c in constraints]
+                ),
+                "name": [c.name for c in constraints],
+                "description": [c.description for c in constraints],
+            },
         )
-        df.columns = MultiIndex.from_product([df.columns, [""]])
-        return concat([df, parameters], axis=1).set_index("id")
+
+    def get_decision_variable(self, variable_id: int) -> DecisionVariable:
+        """
+        Get a decision variable by ID.
+
+        >>> x = DecisionVariable.binary(3)
+        >>> instance = Instance.from_components(
+        ...     decision_variables=[x], objective=x, constraints=[], sense=Instance.MAXIMIZE
+        ... )
+        >>> instance.get_decision_variable(3).id
+        3
+
+        """
+        raw = _find_by_id(
+            self.raw.decision_variables, self._decision_variable_index, variable_id
+        )
+        if raw is None:
+            raise ValueError(f"Decision variable ID {variable_id} is not found")
+        return DecisionVariable(raw)
+
+    def get_constraint(self, constraint_id: int) -> Constraint:
+        """
+        Get a constraint by ID.
+        """
+        raw = _find_by_id(self.raw.constraints, self._constraint_index, constraint_id)
+        if raw is None:
+            raise ValueError(f"Constraint ID {constraint_id} is not found")
+        # A lookup should not change the ID counter as `Constraint.from_raw` does
+        return Constraint._wrap(raw)
 
     def evaluate(self, state: State) -> Solution:
         out, _ = evaluate_instance(self.to_bytes(), state.SerializeToString())
         return Solution.from_bytes(out)
 
+    def evaluate_batch(
+        self, states: Iterable[State | Mapping[int, float]]
+    ) -> list[Solution]:
+        """
+        Evaluate the instance for each of ``states``.
+
+        The instance is serialized and decoded only once for all states,
+        which is faster than calling :meth:`evaluate` repeatedly.
+        The states can be plain mappings from decision variable ID to its value.
+
+        >>> x = [DecisionVariable.binary(i) for i in range(2)]
+        >>> instance = Instance.from_components(
+        ...     decision_variables=x, objective=x[0] + 2 * x[1], constraints=[], sense=Instance.MAXIMIZE
+        ... )
+        >>> solutions = instance.evaluate_batch([State(entries={0: 1, 1: 0}), {0: 1, 1: 1}])
+        >>> [solution.raw.objective for solution in solutions]
+        [1.0, 3.0]
+        """
+        out = evaluate_instance_batch(self.to_bytes(), _state_entries(states))
+        return [Solution.from_bytes(b) for b in out]
+
+    def evaluate_objectives(
+        self, states: Iterable[State | Mapping[int, float]]
+    ) -> DataFrame:
+        """
+        Evaluate the instance for each of ``states``, and returns only the objective values and feasibilities.
+
+        This is faster than :meth:`evaluate_batch` when the other parts of the solutions are not needed,
+        since no :class:`Solution` is created.
+
+        >>> x = [DecisionVariable.binary(i) for i in range(2)]
+        >>> instance = Instance.from_components(
+        ...     decision_variables=x, objective=x[0] + 2 * x[1], constraints=[x[0] + x[1] <= 1], sense=Instance.MAXIMIZE
+        ... )
+        >>> instance.evaluate_objectives([{0: 1, 1: 0}, {0: 1, 1: 1}])
+           objective  feasible
+        0        1.0      True
+        1        3.0     False
+
+        """
+        objectives, feasible = evaluate_instance_objectives(
+            self.to_bytes(), _state_entries(states)
+        )
+        return DataFrame(
+            {
+                "objective": numpy.array(objectives, dtype=numpy.float64),
+                "feasible": numpy.array(feasible, dtype=numpy.bool_),
+            }
+        )
+
+
+def _state_entries(
+    states: Iterable[State | Mapping[int, float]],
+) -> list[dict[int, float]]:
+    """
+    Entries of states as dictionaries to be passed to Rust without serializing ``State`` messages.
+    """
+    return [_state_dict(state) for state in states]
+
+
+def _state_dict(state: State | Mapping[int, float]) -> dict[int, float]:
+    """
+    Entries of a state as ``dict``, since Rust accepts only ``dict`` as a mapping.
+    """
+    if isinstance(state, dict):
+        return state
+    if isinstance(state, State):
+        return dict(state.entries)
+    return dict(state)
+
+
+def _find_by_id(messages, index: dict[int, int], id: int):
+    """
+    Find the message of given ID in a repeated field using ``index`` mapping ID to its position.
+
+    ``index`` is (re-)built when it points to another message for the ID,
+    or when it does not have the ID and seems stale, i.e. it does not cover the messages
+    since the repeated field has been extended or shrunk after the last lookup.
+    Otherwise a missing ID is reported without rebuilding the index.
+    Returns ``None`` if the ID is not found.
+    """
+    i = index.get(id)
+    if i is not None and i < len(messages) and messages[i].id == id:
+        return messages[i]
+    n = len(messages)
+    if (
+        i is None
+        and len(index) == n
+        and (n == 0 or index.get(messages[-1].id) == n - 1)
+    ):
+        return None
+    index.clear()
+    index.update((m.id, i) for i, m in enumerate(messages))
+    i = index.get(id)
+    if i is None:
+        return None
+    return messages[i]
+
 
 @dataclass
 class Solution:
@@ -208,85 +358,165 @@ class Solution:
     @property
     def constraints(self) -> DataFrame:
         evaluation = self.raw.evaluated_constraints
-        parameters = DataFrame(dict(v.parameters) for v in evaluation)
-        parameters.columns = MultiIndex.from_product(
-            [["parameters"], parameters.columns]
-        )
-        df = DataFrame(
+        n = len(evaluation)
+        return _table(
+            evaluation,
             {
-                "id": v.id,
-                "equality": _equality(v.equality),
-                "value": v.evaluated_value,
-                "used_ids": set(v.used_decision_variable_ids),
-                "name": v.name,
-                "description": v.description,
-            }
-            for v in evaluation
+                "equality": [_equality(v.equality) for v in evaluation],
+                "value": numpy.fromiter(
+                    (v.evaluated_value for v in evaluation), numpy.float64, n
+                ),
+                "used_ids": [set(v.used_decision_variable_ids) for v in evaluation],
+                "name": [v.name for v in evaluation],
+                "description": [v.description for v in evaluation],
+            },
         )
-        df.columns = MultiIndex.from_product([df.columns, [""]])
-        return concat([df, parameters], axis=1).set_index("id")
 
 
 def _decision_variables(obj: _Instance | _Solution) -> DataFrame:
     decision_variables = obj.decision_variables
-    parameters = DataFrame(dict(v.parameters) for v in decision_variables)
-    parameters.columns = MultiIndex.from_product([["parameters"], parameters.columns])
-    df = DataFrame(
+    n = len(decision_variables)
+    return _table(
+        decision_variables,
         {
-            "id": v.id,
-            "kind": _kind(v.kind),
-            "lower": v.bound.lower,
-            "upper": v.bound.upper,
-            "name": v.name,
-            "subscripts": v.subscripts,
-            "description": v.description,
-        }
-        for v in decision_variables
+            "kind": [_kind(v.kind) for v in decision_variables],
+            "lower": numpy.fromiter(
+                (v.bound.lower for v in decision_variables), numpy.float64, n
+            ),
+            "upper": numpy.fromiter(
+                (v.bound.upper for v in decision_variables), numpy.float64, n
+            ),
+            "name": [v.name for v in decision_variables],
+            "subscripts": [v.subscripts for v in decision_variables],
+            "description": [v.description for v in decision_variables],
+        },
     )
-    df.columns = MultiIndex.from_product([df.columns, [""]])
-    return concat([df, parameters], axis=1).set_index("id")
+
+
+def _table(messages, columns: dict[str, list | numpy.ndarray]) -> DataFrame:
+    """
+    DataFrame of messages indexed by their ``id`` field.
+
+    The given columns and ``parameters`` map fields of messages are put in MultiIndex columns
+    as ``(name, "")`` and ``("parameters", key)``, respectively.
+    The DataFrame is created at once from these columns, and the index is given directly
+    instead of ``set_index("id")`` to avoid copying columns.
+    """
+    data: dict[tuple[str, str], list | numpy.ndarray] = {
+        (name, ""): column for name, column in columns.items()
+    }
+    data.update(_parameters_columns(messages))
+    try:
+        ids = numpy.fromiter((m.id for m in messages), numpy.int64, len(messages))
+    except OverflowError:
+        # IDs are uint64, and may not fit in int64
+        ids = numpy.fromiter((m.id for m in messages), numpy.uint64, len(messages))
+    return DataFrame(data, index=Index(ids, name="id"))
+
+
+def _parameters_columns(messages) -> dict[tuple[str, str], list]:
+    """
+    Columns for ``parameters`` map fields of messages, keyed as ``("parameters", key)`` for MultiIndex of DataFrame.
+
+    Keys are collected in one pass, and the columns are built without row-wise dictionaries.
+    Missing values are filled with NaN as ``DataFrame`` does for rows of dictionaries.
+    It is empty if no message has parameters.
+    """
+    keys = dict.fromkeys(key for message in messages for key in message.parameters)
+    return {
+        ("parameters", key): [message.parameters.get(key, nan) for message in messages]
+        for key in keys
+    }
 
 
 def _function_type(function: _Function) -> str:
-    if function.HasField("constant"):
-        return "constant"
-    if function.HasField("linear"):
-        return "linear"
-    if function.HasField("quadratic"):
-        return "quadratic"
-    if function.HasField("polynomial"):
-        return "polynomial"
-    raise ValueError("Unknown function type")
+    # The name of the field set in `oneof function` is used as the type name, i.e.
+    # "constant", "linear", "quadratic", or "polynomial"
+    which = function.WhichOneof("function")
+    if which is None:
+        raise ValueError("Unknown function type")
+    return which
+
+
+_KIND_NAMES: dict[_DecisionVariable.Kind.ValueType, str] = {
+    _DecisionVariable.Kind.KIND_UNSPECIFIED: "unspecified",
+    _DecisionVariable.Kind.KIND_BINARY: "binary",
+    _DecisionVariable.Kind.KIND_INTEGER: "integer",
+    _DecisionVariable.Kind.KIND_CONTINUOUS: "continuous",
+    _DecisionVariable.Kind.KIND_SEMI_INTEGER: "semi-integer",
+    _DecisionVariable.Kind.KIND_SEMI_CONTINUOUS: "semi-continuous",
+}
 
 
 def _kind(kind: _DecisionVariable.Kind.ValueType) -> str:
-    if kind == _DecisionVariable.Kind.KIND_UNSPECIFIED:
-        return "unspecified"
-    if kind == _DecisionVariable.Kind.KIND_BINARY:
-        return "binary"
-    if kind == _DecisionVariable.Kind.KIND_INTEGER:
-        return "integer"
-    if kind == _DecisionVariable.Kind.KIND_CONTINUOUS:
-        return "continuous"
-    if kind == _DecisionVariable.Kind.KIND_SEMI_INTEGER:
-        return "semi-integer"
-    if kind == _DecisionVariable.Kind.KIND_SEMI_CONTINUOUS:
-        return "semi-continuous"
-    raise ValueError("Unknown kind")
+    try:
+        return _KIND_NAMES[kind]
+    except KeyError:
+        raise ValueError("Unknown kind") from None
+
+
+_EQUALITY_NAMES: dict[Equality.ValueType, str] = {
+    Equality.EQUALITY_EQUAL_TO_ZERO: "=0",
+    Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO: "<=0",
+}
 
 
 def _equality(equality: Equality.ValueType) -> str:
-    if equality == Equality.EQUALITY_EQUAL_TO_ZERO:
-        return "=0"
-    if equality == Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO:
-        return "<=0"
-    raise ValueError("Unknown equality")
+    try:
+        return _EQUALITY_NAMES[equality]
+    except KeyError:
+        raise ValueError("Unknown equality") from None
+
+
+# Messages having only the kind and the default bound, copied by the factory methods of DecisionVariable,
+# since copying a message is several times faster than passing the fields to the constructor.
+_DECISION_VARIABLE_TEMPLATES: dict[
+    _DecisionVariable.Kind.ValueType, _DecisionVariable
+] = {
+    kind: _DecisionVariable(
+        kind=kind, bound=Bound(lower=float("-inf"), upper=float("inf"))
+    )
+    for kind in _KIND_NAMES
+}
+# `DecisionVariable.binary` does not set a bound
+_BINARY_TEMPLATE = _DecisionVariable(kind=_DecisionVariable.Kind.KIND_BINARY)
+
+
+def _decision_variable(
+    template: _DecisionVariable,
+    id: int,
+    lower: Optional[float],
+    upper: Optional[float],
+    name: Optional[str],
+    subscripts: Optional[list[int]],
+    parameters: Optional[dict[str, str]],
+    description: Optional[str],
+) -> DecisionVariable:
+    raw = _DecisionVariable()
+    raw.CopyFrom(template)
+    raw.id = id
+    # The bound of templates is already the default one
+    if lower is not None and lower != float("-inf"):
+        raw.bound.lower = lower
+    if upper is not None and upper != float("inf"):
+        raw.bound.upper = upper
+    if name is not None:
+        raw.name = name
+    if subscripts is not None:
+        raw.subscripts.extend(subscripts)
+    if parameters is not None:
+        raw.parameters.update(parameters)
+    if description is not None:
+        raw.description = description
+    return DecisionVariable(raw)
 
 
 @dataclass
 class DecisionVariable:
     raw: _DecisionVariable
 
+    __slots__ = ("raw", "_id")
+
     Kind = _DecisionVariable.Kind.ValueType
 
     BINARY = _DecisionVariable.Kind.KIND_BINARY
@@ -307,16 +537,21 @@ class DecisionVariable:
         parameters: Optional[dict[str, str]] = None,
         description: Optional[str] = None,
     ) -> DecisionVariable:
-        return DecisionVariable(
-            _DecisionVariable(
-                id=id,
-                kind=kind,
-                bound=Bound(lower=lower, upper=upper),
-                name=name,
-                subscripts=subscripts,
-                parameters=parameters,
-                description=description,
+        template = _DECISION_VARIABLE_TEMPLATES.get(kind)
+        if template is None:
+            # Kinds without a template, e.g. added in a newer schema, are kept as they are
+            template = _DecisionVariable(
+                kind=kind, bound=Bound(lower=float("-inf"), upper=float("inf"))
             )
+        return _decision_variable(
+            template,
+            id,
+            lower,
+            upper,
+            name,
+            subscripts,
+            parameters,
+            description,
         )
 
     @staticmethod
@@ -328,15 +563,15 @@ class DecisionVariable:
         parameters: Optional[dict[str, str]] = None,
         description: Optional[str] = None,
     ) -> DecisionVariable:
-        return DecisionVariable(
-            _DecisionVariable(
-                id=id,
-                kind=_DecisionVariable.Kind.KIND_BINARY,
-                name=name,
-                subscripts=subscripts,
-                parameters=parameters,
-                description=description,
-            )
+        return _decision_variable(
+            _BINARY_TEMPLATE,
+            id,
+            None,
+            None,
+            name,
+            subscripts,
+            parameters,
+            description,
         )
 
     @staticmethod
@@ -350,16 +585,15 @@ class DecisionVariable:
         parameters: Optional[dict[str, str]] = None,
         description: Optional[str] = None,
     ) -> DecisionVariable:
-        return DecisionVariable(
-            _DecisionVariable(
-                id=id,
-                kind=_DecisionVariable.Kind.KIND_INTEGER,
-                bound=Bound(lower=lower, upper=upper),
-                name=name,
-                subscripts=subscripts,
-                parameters=parameters,
-                description=description,
-            )
+        return _decision_variable(
+            _DECISION_VARIABLE_TEMPLATES[DecisionVariable.INTEGER],
+            id,
+            lower,
+            upper,
+            name,
+            subscripts,
+            parameters,
+            description,
         )
 
     @staticmethod
@@ -373,16 +607,15 @@ class DecisionVariable:
         parameters: Optional[dict[str, str]] = None,
         description: Optional[str] = None,
     ) -> DecisionVariable:
-        return DecisionVariable(
-            _DecisionVariable(
-                id=id,
-                kind=_DecisionVariable.Kind.KIND_CONTINUOUS,
-                bound=Bound(lower=lower, upper=upper),
-                name=name,
-                subscripts=subscripts,
-                parameters=parameters,
-                description=description,
-            )
+        return _decision_variable(
+            _DECISION_VARIABLE_TEMPLATES[DecisionVariable.CONTINUOUS],
+            id,
+            lower,
+            upper,
+            name,
+            subscripts,
+            parameters,
+            description,
         )
 
     @staticmethod
@@ -396,16 +629,15 @@ class DecisionVariable:
         parameters: Optional[dict[str, str]] = None,
         description: Optional[str] = None,
     ) -> DecisionVariable:
-        return DecisionVariable(
-            _DecisionVariable(
-                id=id,
-                kind=_DecisionVariable.Kind.KIND_SEMI_INTEGER,
-                bound=Bound(lower=lower, upper=upper),
-                name=name,
-                subscripts=subscripts,
-                parameters=parameters,
-                description=description,
-            )
+        return _decision_variable(
+            _DECISION_VARIABLE_TEMPLATES[DecisionVariable.SEMI_INTEGER],
+            id,
+            lower,
+            upper,
+            name,
+            subscripts,
+            parameters,
+            description,
         )
 
     @staticmethod
@@ -419,18 +651,25 @@ class DecisionVariable:
         parameters: Optional[dict[str, str]] = None,
         description: Optional[str] = None,
     ) -> DecisionVariable:
-        return DecisionVariable(
-            _DecisionVariable(
-                id=id,
-                kind=_DecisionVariable.Kind.KIND_SEMI_CONTINUOUS,
-                bound=Bound(lower=lower, upper=upper),
-                name=name,
-                subscripts=subscripts,
-                parameters=parameters,
-                description=description,
-            )
+        return _decision_variable(
+            _DECISION_VARIABLE_TEMPLATES[DecisionVariable.SEMI_CONTINUOUS],
+            id,
+            lower,
+            upper,
+            name,
+            subscripts,
+            parameters,
+            description,
         )
 
+    def __post_init__(self):
+        # Cache the ID since it is read several times in every arithmetic operation
+        self._id = self.raw.id
+
+    @property
+    def id(self) -> int:
+        return self._id
+
     @property
     def kind(self) -> Kind:
         return self.raw.kind
@@ -439,6 +678,30 @@ class DecisionVariable:
     def bound(self) -> Bound:
         return self.raw.bound
 
+    @property
+    def name(self) -> str:
+        return self.raw.name
+
+    @property
+    def subscripts(self) -> Sequence[int]:
+        """
+        Subscripts of this decision variable. This is a view of the raw message, not a copy,
+        so modifying it modifies :py:attr:`raw`.
+        """
+        return self.raw.subscripts
+
+    @property
+    def parameters(self) -> Mapping[str, str]:
+        """
+        Parameters of this decision variable. This is a view of the raw message, not a copy,
+        so modifying it modifies :py:attr:`raw`.
+        """
+        return self.raw.parameters
+
+    @property
+    def description(self) -> str:
+        return self.raw.description
+
     def equals_to(self, other: DecisionVariable) -> bool:
         """
         Alternative to ``==`` operator to compare two decision variables.
@@ -447,19 +710,25 @@ class DecisionVariable:
 
     def __add__(self, other: int | float | DecisionVariable) -> Linear:
         if isinstance(other, float) or isinstance(other, int):
-            return Linear(terms={self.raw.id: 1}, constant=other)
+            return Linear(terms={self._id: 1}, constant=other)
         if isinstance(other, DecisionVariable):
-            if self.raw.id == other.raw.id:
-                return Linear(terms={self.raw.id: 2})
+            if self._id == other._id:
+                return Linear(terms={self._id: 2})
             else:
-                return Linear(terms={self.raw.id: 1, other.raw.id: 1})
+                return Linear(terms={self._id: 1, other._id: 1})
         return NotImplemented
 
     def __sub__(self, other) -> Linear:
+        if isinstance(other, DecisionVariable):
+            if self._id == other._id:
+                # Same as `x * 0`, no term with zero coefficient
+                return Linear(terms={})
+            else:
+                return Linear(terms={self._id: 1, other._id: -1})
         return self + (-other)
 
     def __neg__(self) -> Linear:
-        return Linear(terms={self.raw.id: -1})
+        return Linear(terms={self._id: -1})
 
     def __radd__(self, other) -> Linear:
         return self + other
@@ -469,7 +738,10 @@ class DecisionVariable:
 
     def __mul__(self, other: int | float) -> Linear:
         if isinstance(other, float) or isinstance(other, int):
-            return Linear(terms={self.raw.id: other})
+            if other == 0:
+                # A fresh object every time since Linear is mutable
+                return Linear(terms={})
+            return Linear(terms={self._id: other})
         return NotImplemented
 
     def __rmul__(self, other) -> Linear:
@@ -489,18 +761,22 @@ class DecisionVariable:
         Constraint(...)
 
         """
+        # `x == 0` is common, and `x` itself can be the function
         return Constraint(
-            function=self - other, equality=Equality.EQUALITY_EQUAL_TO_ZERO
+            function=self if _is_zero(other) else self - other,
+            equality=Equality.EQUALITY_EQUAL_TO_ZERO,
         )
 
     def __le__(self, other) -> Constraint:
         return Constraint(
-            function=self - other, equality=Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO
+            function=self if _is_zero(other) else self - other,
+            equality=Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO,
         )
 
     def __ge__(self, other) -> Constraint:
         return Constraint(
-            function=other - self, equality=Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO
+            function=-self if _is_zero(other) else other - self,
+            equality=Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO,
         )
 
     def __req__(self, other) -> Constraint:
@@ -513,41 +789,256 @@ class DecisionVariable:
         return self.__le__(other)
 
 
+def _is_zero(value) -> bool:
+    return isinstance(value, (int, float)) and value == 0
+
+
+def _linear_terms(raw: _Linear) -> dict[int, float]:
+    """
+    Coefficients of a linear function keyed by ID, where terms of the same ID are summed up.
+    """
+    terms: dict[int, float] = {}
+    for term in raw.terms:
+        terms[term.id] = terms.get(term.id, 0) + term.coefficient
+    return terms
+
+
+def _encode_linear(
+    ids: Sequence[int], coefficients: Sequence[float | int], constant: float | int
+) -> bytes:
+    """
+    :py:func:`encode_linear` raising the same error as protobuf for IDs out of the range of uint64.
+    """
+    try:
+        return encode_linear(ids, coefficients, constant)
+    except OverflowError:
+        for id in ids:
+            if isinstance(id, int) and not 0 <= id < 2**64:
+                raise ValueError(f"Value out of range: {id}") from None
+        raise
+
+
 @dataclass
 class Linear:
     raw: _Linear
 
+    __slots__ = ("raw",)
+
     def equals_to(self, other: Linear) -> bool:
         """
         Alternative to ``==`` operator to compare two linear functions.
+
+        This compares the raw messages, so it depends on the order of terms,
+        and on terms of the same ID, which :py:meth:`__iadd__` appends without merging.
         """
         return self.raw == other.raw
 
+    def almost_equal(self, other: Linear, *, atol: float = 1e-10) -> bool:
+        """
+        Check whether two linear functions have almost equal coefficients and constant.
+
+        Unlike :py:meth:`equals_to`, this does not depend on the order of terms,
+        and terms of the same ID are summed up before comparison.
+
+        >>> x = DecisionVariable.integer(1)
+        >>> y = DecisionVariable.integer(2)
+        >>> assert (x + y).almost_equal(y + x + 1e-12)
+
+        """
+        if abs(self.raw.constant - other.raw.constant) > atol:
+            return False
+        lhs = _linear_terms(self.raw)
+        rhs = _linear_terms(other.raw)
+        for id, coefficient in lhs.items():
+            if abs(coefficient - rhs.pop(id, 0)) > atol:
+                return False
+        # IDs only in `other`
+        return all(abs(coefficient) <= atol for coefficient in rhs.values())
+
     def __init__(self, *, terms: dict[int, float | int], constant: float | int = 0):
-        self.raw = _Linear(
-            terms=[
-                _Linear.Term(id=id, coefficient=coefficient)
-                for id, coefficient in terms.items()
-            ],
-            constant=constant,
+        if not terms:
+            self.raw = _Linear(constant=constant)
+            return
+        # Encoding the message in Rust and parsing it is faster than creating a Term message
+        # for each term in Python even for a single term, e.g. with upb protobuf,
+        # 1.4 us + 0.4 us for calling Rust vs 4.1 us for one term, and 1.6 us + 0.4 us vs 14.2 us for 8 terms.
+        self.raw = _Linear()
+        self.raw.ParseFromString(
+            _encode_linear(list(terms.keys()), list(terms.values()), constant)
         )
 
-    def __add__(self, other: int | float | DecisionVariable | Linear) -> Linear:
+    @staticmethod
+    def from_bytes(data: bytes) -> Linear:
+        new = Linear.__new__(Linear)
+        new.raw = _Linear()
+        new.raw.ParseFromString(data)
+        return new
+
+    def to_bytes(self) -> bytes:
+        return self.raw.SerializeToString()
+
+    def evaluate(self, state: State | Mapping[int, float]) -> tuple[float, set[int]]:
+        """
+        Evaluate the linear function with the given state.
+
+        Returns the value and the set of decision variable IDs used in the evaluation.
+        The state can be a plain mapping from decision variable ID to its value.
+
+        >>> x = DecisionVariable.integer(1)
+        >>> y = DecisionVariable.integer(2)
+        >>> (2 * x + 3 * y + 1).evaluate(State(entries={1: 3, 2: 1}))
+        (10.0, {1, 2})
+        >>> (2 * x + 3 * y + 1).evaluate({1: 3, 2: 1})
+        (10.0, {1, 2})
+
+        """
+        if isinstance(state, State):
+            return evaluate_linear(self.to_bytes(), state.SerializeToString())
+        return evaluate_linear_dict(self.to_bytes(), _state_dict(state))
+
+    def evaluate_batch(
+        self, states: Iterable[State | Mapping[int, float]]
+    ) -> list[float]:
+        """
+        Evaluate the linear function for each of ``states``, and returns the list of values.
+
+        The linear function is serialized and decoded only once for all states.
+
+        >>> x = DecisionVariable.integer(1)
+        >>> y = DecisionVariable.integer(2)
+        >>> (2 * x + 3 * y + 1).evaluate_batch([{1: 3, 2: 1}, {1: 0, 2: 2}])
+        [10.0, 7.0]
+
+        """
+        return evaluate_linear_batch(self.to_bytes(), _state_entries(states))
+
+    @staticmethod
+    def from_pairs(
+        ids: Sequence[int],
+        coefficients: Sequence[float | int],
+        constant: float | int = 0,
+    ) -> Linear:
+        """
+        Create a linear function from the sequences of decision variable IDs and their coefficients.
+
+        The message is built at once in Rust, so prefer this to ``sum(...)`` for a linear function with many terms,
+        since ``sum`` creates an intermediate :py:class:`Linear` for every term.
+
+        Examples
+        ========
+
+        >>> p = [10, 13, 18]
+        >>> objective = Linear.from_pairs(range(3), p)
+        >>> x = [DecisionVariable.binary(i) for i in range(3)]
+        >>> assert objective.equals_to(sum(p[i] * x[i] for i in range(3)))
+
+        """
+        return Linear.from_bytes(_encode_linear(ids, coefficients, constant))
+
+    @staticmethod
+    def sum(operands: Iterable[int | float | DecisionVariable | Linear]) -> Linear:
+        """
+        Sum up the operands into a single linear function.
+
+        Unlike the builtin ``sum``, which copies the accumulated terms for every addition,
+        this collects all terms at once, and terms of the same ID are merged.
+
+        Examples
+        ========
+
+        >>> x = [DecisionVariable.binary(i) for i in range(3)]
+        >>> f = Linear.sum([2 * x[0], x[1], 3 * x[0] + 1, 2])
+        >>> assert f.equals_to(Linear(terms={0: 5, 1: 1}, constant=3))
+
+        """
+        terms: dict[int, float | int] = {}
+        constant: float | int = 0
+        for operand in operands:
+            if isinstance(operand, float) or isinstance(operand, int):
+                constant += operand
+            elif isinstance(operand, DecisionVariable):
+                terms[operand.id] = terms.get(operand.id, 0) + 1
+            elif isinstance(operand, Linear):
+                for term in operand.raw.terms:
+                    terms[term.id] = terms.get(term.id, 0) + term.coefficient
+                constant += operand.raw.constant
+            else:
+                raise TypeError(f"Cannot sum up {type(operand)} as a linear function")
+        return Linear(terms=terms, constant=constant)
+
+    def __iadd__(self, other: int | float | DecisionVariable | Linear) -> Linear:
+        """
+        In-place addition, which appends the terms of ``other`` to this linear function without creating a new one.
+
+        Terms of the same ID are not merged, i.e. :py:attr:`raw` may contain several terms of the same ID,
+        but it does not change the value of this linear function.
+        The other operations of :py:class:`Linear` sum up the coefficients of such terms.
+        """
         if isinstance(other, float) or isinstance(other, int):
             self.raw.constant += other
             return self
         if isinstance(other, DecisionVariable):
-            terms = {term.id: term.coefficient for term in self.raw.terms}
-            terms[other.raw.id] = terms.get(other.raw.id, 0) + 1
+            self.raw.terms.add(id=other.id, coefficient=1)
+            return self
+        if isinstance(other, Linear):
+            # Take a snapshot since `other` can be `self`, e.g. `f += f`
+            self.raw.terms.extend(list(other.raw.terms))
+            self.raw.constant += other.raw.constant
+            return self
+        return NotImplemented
+
+    def __add__(self, other: int | float | DecisionVariable | Linear) -> Linear:
+        if isinstance(other, float) or isinstance(other, int):
+            # Operands are never modified. Use `+=` to add in place.
+            new = self._copy()
+            new.raw.constant += other
+            return new
+        # When IDs are unique and do not overlap, nothing has to be merged,
+        # and the message can be copied at once and appended.
+        if isinstance(other, DecisionVariable):
+            ids = {term.id for term in self.raw.terms}
+            if len(ids) == len(self.raw.terms) and other.id not in ids:
+                new = self._copy()
+                new.raw.terms.add(id=other.id, coefficient=1)
+                return new
+            terms = _linear_terms(self.raw)
+            terms[other.id] = terms.get(other.id, 0) + 1
             return Linear(terms=terms, constant=self.raw.constant)
         if isinstance(other, Linear):
-            terms = {term.id: term.coefficient for term in self.raw.terms}
+            ids = {term.id for term in self.raw.terms}
+            other_ids = {term.id for term in other.raw.terms}
+            if (
+                len(ids) == len(self.raw.terms)
+                and len(other_ids) == len(other.raw.terms)
+                and ids.isdisjoint(other_ids)
+            ):
+                new = self._copy()
+                new.raw.terms.extend(other.raw.terms)
+                new.raw.constant += other.raw.constant
+                return new
+            terms = _linear_terms(self.raw)
             for term in other.raw.terms:
                 terms[term.id] = terms.get(term.id, 0) + term.coefficient
             return Linear(terms=terms, constant=self.raw.constant + other.raw.constant)
         return NotImplemented
 
+    def _copy(self) -> Linear:
+        new = Linear.__new__(Linear)
+        new.raw = _Linear()
+        new.raw.CopyFrom(self.raw)
+        return new
+
     def __sub__(self, other) -> Linear:
+        # Subtract directly without creating `-other`
+        if isinstance(other, DecisionVariable):
+            terms = _linear_terms(self.raw)
+            terms[other.id] = terms.get(other.id, 0) - 1
+            return Linear(terms=terms, constant=self.raw.constant)
+        if isinstance(other, Linear):
+            terms = _linear_terms(self.raw)
+            for term in other.raw.terms:
+                terms[term.id] = terms.get(term.id, 0) - term.coefficient
+            return Linear(terms=terms, constant=self.raw.constant - other.raw.constant)
         return self + (-other)
 
     def __radd__(self, other) -> Linear:
@@ -558,17 +1049,34 @@ class Linear:
 
     def __mul__(self, other: int | float) -> Linear:
         if isinstance(other, float) or isinstance(other, int):
-            return Linear(
-                terms={term.id: term.coefficient * other for term in self.raw.terms},
-                constant=self.raw.constant * other,
-            )
+            if other == 0:
+                return Linear(terms={})
+            if other == 1:
+                return self._copy()
+            return self._scaled(other)
         return NotImplemented
 
+    def _scaled(self, factor: int | float) -> Linear:
+        if len({term.id for term in self.raw.terms}) == len(self.raw.terms):
+            # Scale a copy in place, rather than creating all the terms again
+            new = self._copy()
+            for term in new.raw.terms:
+                term.coefficient *= factor
+            new.raw.constant *= factor
+            return new
+        return Linear(
+            terms={
+                id: coefficient * factor
+                for id, coefficient in _linear_terms(self.raw).items()
+            },
+            constant=self.raw.constant * factor,
+        )
+
     def __rmul__(self, other) -> Linear:
         return self * other
 
     def __neg__(self) -> Linear:
-        return -1 * self
+        return self._scaled(-1)
 
     def __eq__(self, other) -> Constraint:  # type: ignore[reportGeneralTypeIssues]
         """
@@ -587,16 +1095,32 @@ class Linear:
         >>> assert (x + y).equals_to(Linear(terms={1: 1, 2: 1}))
 
         """
-        return Constraint(
-            function=self - other, equality=Equality.EQUALITY_EQUAL_TO_ZERO
-        )
+        return _difference_constraint(self, other, Equality.EQUALITY_EQUAL_TO_ZERO)
 
     def __le__(self, other) -> Constraint:
-        return Constraint(
-            function=self - other, equality=Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO
+        return _difference_constraint(
+            self, other, Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO
         )
 
     def __ge__(self, other) -> Constraint:
+        if (isinstance(other, float) or isinstance(other, int)) and len(
+            {term.id for term in self.raw.terms}
+        ) == len(self.raw.terms):
+            # Negate the copy in the constraint in place, rather than copying `-self` again
+            constraint = Constraint(
+                function=self, equality=Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO
+            )
+            linear = constraint.raw.function.linear
+            for term in linear.terms:
+                term.coefficient *= -1
+            linear.constant *= -1
+            linear.constant -= -other
+            return constraint
+        if isinstance(other, float) or isinstance(other, int):
+            # `-self` merges the duplicated IDs appended by `__iadd__`
+            return _difference_constraint(
+                -self, -other, Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO
+            )
         return Constraint(
             function=other - self, equality=Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO
         )
@@ -611,10 +1135,28 @@ class Linear:
         return self.__le__(other)
 
 
+def _difference_constraint(
+    lhs: Linear, rhs, equality: Equality.ValueType
+) -> Constraint:
+    """
+    Constraint of ``lhs - rhs`` compared to zero.
+
+    For scalar ``rhs``, it is subtracted from the constant of the function in the constraint,
+    which is copied from ``lhs`` anyway, without creating ``lhs - rhs`` or modifying ``lhs``.
+    """
+    if isinstance(rhs, float) or isinstance(rhs, int):
+        constraint = Constraint(function=lhs, equality=equality)
+        constraint.raw.function.linear.constant -= rhs
+        return constraint
+    return Constraint(function=lhs - rhs, equality=equality)
+
+
 @dataclass
 class Quadratic:
     raw: _Quadratic
 
+    __slots__ = ("raw",)
+
     def __init__(
         self,
         *,
@@ -630,6 +1172,34 @@ class Quadratic:
             linear=linear.raw if linear else None,
         )
 
+    def to_bytes(self) -> bytes:
+        return self.raw.SerializeToString()
+
+    def evaluate(self, state: State | Mapping[int, float]) -> tuple[float, set[int]]:
+        """
+        Evaluate the quadratic function with the given state.
+
+        Returns the value and the set of decision variable IDs used in the evaluation.
+
+        >>> f = Quadratic(columns=[1, 2], raws=[1, 3], values=[2, 1], linear=Linear(terms={2: 1}))
+        >>> f.evaluate({1: 2, 2: 3, 3: 1})
+        (14.0, {1, 2, 3})
+
+        """
+        if isinstance(state, State):
+            return evaluate_quadratic(self.to_bytes(), state.SerializeToString())
+        return evaluate_quadratic_dict(self.to_bytes(), _state_dict(state))
+
+    def evaluate_batch(
+        self, states: Iterable[State | Mapping[int, float]]
+    ) -> list[float]:
+        """
+        Evaluate the quadratic function for each of ``states``, and returns the list of values.
+
+        The quadratic function is serialized and decoded only once for all states.
+        """
+        return evaluate_quadratic_batch(self.to_bytes(), _state_entries(states))
+
     # TODO: Implement __add__, __radd__, __mul__, __rmul__
 
 
@@ -637,6 +1207,8 @@ class Quadratic:
 class Polynomial:
     raw: _Polynomial
 
+    __slots__ = ("raw",)
+
     def __init__(self, *, coefficients: Iterable[tuple[Iterable[int], float | int]]):
         self.raw = _Polynomial(
             terms=[
@@ -645,6 +1217,63 @@ class Polynomial:
             ]
         )
 
+    @staticmethod
+    def from_bytes(data: bytes) -> Polynomial:
+        new = Polynomial.__new__(Polynomial)
+        new.raw = _Polynomial()
+        new.raw.ParseFromString(data)
+        return new
+
+    def to_bytes(self) -> bytes:
+        return self.raw.SerializeToString()
+
+    @staticmethod
+    def from_csr(
+        ids: Sequence[int] | numpy.ndarray,
+        offsets: Sequence[int] | numpy.ndarray,
+        coefficients: Sequence[float | int] | numpy.ndarray,
+    ) -> Polynomial:
+        """
+        Create a polynomial from monomials in CSR (compressed sparse row) format.
+
+        The IDs of the ``i``-th monomial are ``ids[offsets[i]:offsets[i + 1]]``, and its coefficient is ``coefficients[i]``,
+        i.e. ``offsets`` has one more element than ``coefficients``. NumPy arrays can be used for these arguments.
+        The message is built at once in Rust without creating a Python object for each monomial.
+
+        Examples
+        ========
+
+        >>> f = Polynomial.from_csr(ids=[1, 2, 2, 3, 1], offsets=[0, 2, 4, 5], coefficients=[2, 3, 1])
+        >>> assert f.raw == Polynomial(coefficients=[([1, 2], 2), ([2, 3], 3), ([1], 1)]).raw
+
+        """
+        return Polynomial.from_bytes(encode_polynomial(ids, offsets, coefficients))
+
+    def evaluate(self, state: State | Mapping[int, float]) -> tuple[float, set[int]]:
+        """
+        Evaluate the polynomial with the given state.
+
+        Returns the value and the set of decision variable IDs used in the evaluation.
+
+        >>> f = Polynomial(coefficients=[([1, 2, 3], 2), ([1], 1)])
+        >>> f.evaluate({1: 2, 2: 3, 3: 1})
+        (14.0, {1, 2, 3})
+
+        """
+        if isinstance(state, State):
+            return evaluate_polynomial(self.to_bytes(), state.SerializeToString())
+        return evaluate_polynomial_dict(self.to_bytes(), _state_dict(state))
+
+    def evaluate_batch(
+        self, states: Iterable[State | Mapping[int, float]]
+    ) -> list[float]:
+        """
+        Evaluate the polynomial for each of ``states``, and returns the list of values.
+
+        The polynomial is serialized and decoded only once for all states.
+        """
+        return evaluate_polynomial_batch(self.to_bytes(), _state_entries(states))
+
     # TODO: Implement __add__, __radd__, __mul__, __rmul__
 
 
@@ -654,7 +1283,7 @@ def as_function(
     if isinstance(f, (int, float)):
         return _Function(constant=f)
     elif isinstance(f, DecisionVariable):
-        return _Function(linear=Linear(terms={f.raw.id: 1}).raw)
+        return _Function(linear=Linear(terms={f.id: 1}).raw)
     elif isinstance(f, Linear):
         return _Function(linear=f.raw)
     elif isinstance(f, Quadratic):
@@ -670,20 +1299,52 @@ def as_function(
 @dataclass
 class Constraint:
     raw: _Constraint
-    _counter = 0
+
+    __slots__ = ("raw",)
+
+    _counter = itertools.count()
+    # Guards taking an ID from `_counter` and replacing `_counter` in `from_raw`,
+    # so that no ID is taken between reading and replacing the counter.
+    _counter_lock = threading.Lock()
 
     EQUAL_TO_ZERO = Equality.EQUALITY_EQUAL_TO_ZERO
     LESS_THAN_OR_EQUAL_TO_ZERO = Equality.EQUALITY_LESS_THAN_OR_EQUAL_TO_ZERO
 
+    @staticmethod
+    def _wrap(raw: _Constraint) -> Constraint:
+        """
+        Wrap an existing message without copying it and without changing the ID counter.
+        """
+        new = Constraint.__new__(Constraint)
+        new.raw = raw
+        return new
+
+    @staticmethod
+    def from_raw(raw: _Constraint) -> Constraint:
+        """
+        Wrap an existing ``ommx.v1.Constraint`` message without copying it.
+
+        The ID of the message is kept, and the IDs of constraints created after this call are larger than it.
+        """
+        new = Constraint._wrap(raw)
+        # `itertools.count` does not expose its next value, so take it out
+        # and restart the counter from it, or from after this ID if larger.
+        with Constraint._counter_lock:
+            Constraint._counter = itertools.count(
+                max(next(Constraint._counter), raw.id + 1)
+            )
+        return new
+
     def __init__(
         self,
         *,
         function: int | float | DecisionVariable | Linear | Quadratic | Polynomial,
         equality: Equality.ValueType,
     ):
+        with Constraint._counter_lock:
+            id = next(Constraint._counter)
         self.raw = _Constraint(
-            id=Constraint._counter,
+            id=id,
             function=as_function(function),
             equality=equality,
         )
-        Constraint._counter += 1
@@ -4,7 +4,7 @@ use ommx::{
     Evaluate, Message,
 };
 use pyo3::{prelude::*, types::PyBytes};
-use std::collections::BTreeSet;
+use std::collections::{BTreeSet, HashMap};
 
 macro_rules! define_evaluate_function {
     ($evaluated:ty, $name:ident) => {
@@ -25,6 +25,47 @@ define_evaluate_function!(Linear, evaluate_linear);
 define_evaluate_function!(Quadratic, evaluate_quadratic);
 define_evaluate_function!(Polynomial, evaluate_polynomial);
 
+macro_rules! define_evaluate_function_with_dict {
+    ($evaluated:ty, $name:ident) => {
+        #[pyfunction]
+        pub fn $name(
+            function: &Bound<PyBytes>,
+            state: HashMap<u64, f64>,
+        ) -> Result<(f64, BTreeSet<u64>)> {
+            let state = State { entries: state };
+            let function = <$evaluated>::decode(function.as_bytes())?;
+            function.evaluate(&state)
+        }
+    };
+}
+
+define_evaluate_function_with_dict!(Linear, evaluate_linear_dict);
+define_evaluate_function_with_dict!(Quadratic, evaluate_quadratic_dict);
+define_evaluate_function_with_dict!(Polynomial, evaluate_polynomial_dict);
+
+macro_rules! define_evaluate_function_batch {
+    ($evaluated:ty, $name:ident) => {
+        #[pyfunction]
+        pub fn $name(
+            function: &Bound<PyBytes>,
+            states: Vec<HashMap<u64, f64>>,
+        ) -> Result<Vec<f64>> {
+            let function = <$evaluated>::decode(function.as_bytes())?;
+            states
+                .into_iter()
+                .map(|entries| {
+                    let (value, _used_ids) = function.evaluate(&State { entries })?;
+                    Ok(value)
+                })
+                .collect()
+        }
+    };
+}
+
+define_evaluate_function_batch!(Linear, evaluate_linear_batch);
+define_evaluate_function_batch!(Quadratic, evaluate_quadratic_batch);
+define_evaluate_function_batch!(Polynomial, evaluate_polynomial_batch);
+
 macro_rules! define_evaluate_object {
     ($evaluated:ty, $name:ident) => {
         #[pyfunction]
@@ -49,3 +90,49 @@ pub fn used_decision_variable_ids(function: &Bound<PyBytes>) -> BTreeSet<u64> {
     let function = Function::decode(function.as_bytes()).unwrap();
     function.used_decision_variable_ids()
 }
+
+#[pyfunction]
+pub fn used_decision_variable_ids_batch(
+    functions: Vec<Bound<'_, PyBytes>>,
+) -> Result<Vec<BTreeSet<u64>>> {
+    functions
+        .iter()
+        .map(|function| {
+            let function = Function::decode(function.as_bytes())?;
+            Ok(function.used_decision_variable_ids())
+        })
+        .collect()
+}
+
+#[pyfunction]
+pub fn evaluate_instance_batch<'py>(
+    py: Python<'py>,
+    instance: &Bound<'py, PyBytes>,
+    states: Vec<HashMap<u64, f64>>,
+) -> Result<Vec<Bound<'py, PyBytes>>> {
+    let instance = Instance::decode(instance.as_bytes())?;
+    states
+        .into_iter()
+        .map(|entries| {
+            let (evaluated, _used_ids) = instance.evaluate(&State { entries })?;
+            Ok(PyBytes::new_bound(py, &evaluated.encode_to_vec()))
+        })
+        .collect()
+}
+
+/// Evaluate the instance for each state, and returns only the objective values and feasibilities.
+#[pyfunction]
+pub fn evaluate_instance_objectives(
+    instance: &Bound<PyBytes>,
+    states: Vec<HashMap<u64, f64>>,
+) -> Result<(Vec<f64>, Vec<bool>)> {
+    let instance = Instance::decode(instance.as_bytes())?;
+    let mut objectives = Vec::with_capacity(states.len());
+    let mut feasible = Vec::with_capacity(states.len());
+    for entries in states {
+        let (solution, _used_ids) = instance.evaluate(&State { entries })?;
+        objectives.push(solution.objective);
+        feasible.push(solution.feasible);
+    }
+    Ok((objectives, feasible))
+}
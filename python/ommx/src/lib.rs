@@ -2,11 +2,13 @@ mod artifact;
 mod builder;
 mod descriptor;
 mod evaluate;
+mod message;
 
 pub use artifact::*;
 pub use builder::*;
 pub use descriptor::*;
 pub use evaluate::*;
+pub use message::*;
 
 use pyo3::prelude::*;
 
@@ -23,8 +25,19 @@ fn _ommx_rust(_py: Python, m: &Bound<PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(evaluate_linear, m)?)?;
     m.add_function(wrap_pyfunction!(evaluate_quadratic, m)?)?;
     m.add_function(wrap_pyfunction!(evaluate_polynomial, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_linear_dict, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_quadratic_dict, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_polynomial_dict, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_linear_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_quadratic_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_polynomial_batch, m)?)?;
     m.add_function(wrap_pyfunction!(evaluate_constraint, m)?)?;
     m.add_function(wrap_pyfunction!(evaluate_instance, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_instance_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(evaluate_instance_objectives, m)?)?;
     m.add_function(wrap_pyfunction!(used_decision_variable_ids, m)?)?;
+    m.add_function(wrap_pyfunction!(used_decision_variable_ids_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(encode_linear, m)?)?;
+    m.add_function(wrap_pyfunction!(encode_polynomial, m)?)?;
     Ok(())
 }
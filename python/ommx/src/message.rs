@@ -0,0 +1,64 @@
+use anyhow::{bail, Context, Result};
+use ommx::{
+    v1::{Linear, Monomial, Polynomial},
+    Message,
+};
+use pyo3::{prelude::*, types::PyBytes};
+
+/// Encode pairs of decision variable IDs and coefficients as a serialized `ommx.v1.Linear`
+#[pyfunction]
+pub fn encode_linear<'py>(
+    py: Python<'py>,
+    ids: Vec<u64>,
+    coefficients: Vec<f64>,
+    constant: f64,
+) -> Result<Bound<'py, PyBytes>> {
+    if ids.len() != coefficients.len() {
+        bail!(
+            "Length mismatch: {} IDs and {} coefficients",
+            ids.len(),
+            coefficients.len()
+        );
+    }
+    let linear = Linear::new(ids.into_iter().zip(coefficients), constant);
+    Ok(PyBytes::new_bound(py, &linear.encode_to_vec()))
+}
+
+/// Encode monomials in CSR format as a serialized `ommx.v1.Polynomial`
+///
+/// The IDs of `i`-th monomial are `ids[offsets[i]..offsets[i + 1]]` and its coefficient is `coefficients[i]`.
+#[pyfunction]
+pub fn encode_polynomial<'py>(
+    py: Python<'py>,
+    ids: Vec<u64>,
+    offsets: Vec<usize>,
+    coefficients: Vec<f64>,
+) -> Result<Bound<'py, PyBytes>> {
+    if offsets.len() != coefficients.len() + 1 {
+        bail!(
+            "Length mismatch: {} offsets for {} coefficients, must be one more than coefficients",
+            offsets.len(),
+            coefficients.len()
+        );
+    }
+    let terms = offsets
+        .windows(2)
+        .zip(coefficients)
+        .map(|(range, coefficient)| {
+            let ids = ids
+                .get(range[0]..range[1])
+                .with_context(|| {
+                    format!(
+                        "Invalid offsets {}..{} for {} IDs",
+                        range[0],
+                        range[1],
+                        ids.len()
+                    )
+                })?
+                .to_vec();
+            Ok(Monomial { ids, coefficient })
+        })
+        .collect::<Result<Vec<_>>>()?;
+    let polynomial = Polynomial { terms };
+    Ok(PyBytes::new_bound(py, &polynomial.encode_to_vec()))
+}
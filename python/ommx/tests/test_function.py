@@ -1,13 +1,43 @@
-from ommx.v1 import Linear, DecisionVariable
+from types import MappingProxyType
+
+import numpy
+import pytest
+
+from ommx.v1 import Constraint, Linear, DecisionVariable, Polynomial, Quadratic
+from ommx.v1.solution_pb2 import State
 
 
 def test_decision_variable():
+    x = DecisionVariable.binary(1, name="x", subscripts=[2, 3], parameters={"a": "b"})
+    assert x.id == 1
+    assert x.name == "x"
+    assert list(x.subscripts) == [2, 3]
+    assert dict(x.parameters) == {"a": "b"}
+    assert x.description == ""
+
     assert DecisionVariable.binary(1) + 2 == Linear(terms={1: 1}, constant=2)
     assert 3 + DecisionVariable.binary(1) == Linear(terms={1: 1}, constant=3)
     assert DecisionVariable.binary(1) * 2 == Linear(terms={1: 2})
     assert 3 * DecisionVariable.binary(1) == Linear(terms={1: 3})
 
 
+def test_decision_variable_bound():
+    x = DecisionVariable.integer(1, lower=-2, upper=5)
+    assert (x.bound.lower, x.bound.upper) == (-2, 5)
+    y = DecisionVariable.integer(2)
+    assert (y.bound.lower, y.bound.upper) == (float("-inf"), float("inf"))
+    assert not DecisionVariable.binary(3).raw.HasField("bound")
+    # Variables of the same kind do not share their messages
+    y.raw.bound.lower = 0
+    y.raw.subscripts.append(1)
+    z = DecisionVariable.integer(3)
+    assert z.bound.lower == float("-inf")
+    assert list(z.subscripts) == []
+    # Kinds unknown to this version are accepted as before
+    w = DecisionVariable.of_type(100, 4, lower=0, upper=1)  # type: ignore
+    assert (w.raw.kind, w.bound.lower, w.bound.upper) == (100, 0, 1)
+
+
 def test_linear():
     # add to constants
     assert Linear(terms={}, constant=1) + 2 == Linear(terms={}, constant=3.0)
@@ -28,3 +58,232 @@ def test_linear():
     # add to linear
     assert Linear(terms={1: 2}) + Linear(terms={2: 3}) == Linear(terms={1: 2, 2: 3})
     assert Linear(terms={1: 2}) + Linear(terms={1: 3}) == Linear(terms={1: 5})
+
+
+def test_linear_from_pairs():
+    assert Linear.from_pairs([1, 2], [2, 3], 4).equals_to(
+        Linear(terms={1: 2, 2: 3}, constant=4)
+    )
+    assert Linear.from_pairs([], []).equals_to(Linear(terms={}))
+
+
+def test_linear_iadd():
+    f = Linear(terms={1: 2})
+    g = f
+    f += DecisionVariable.binary(2)
+    f += Linear(terms={3: 4}, constant=1)
+    f += 2
+    assert f is g
+    assert f.equals_to(Linear(terms={1: 2, 2: 1, 3: 4}, constant=3))
+
+    # Terms of the same ID are merged in the subsequent operations
+    f += DecisionVariable.binary(1)
+    assert len(f.raw.terms) == 4
+    assert (f + Linear(terms={})).equals_to(
+        Linear(terms={1: 3, 2: 1, 3: 4}, constant=3)
+    )
+    assert (f * 2).equals_to(Linear(terms={1: 6, 2: 2, 3: 8}, constant=6))
+
+    # Add itself
+    h = Linear(terms={1: 2}, constant=1)
+    h += h
+    assert len(h.raw.terms) == 2
+    assert (h + Linear(terms={})).equals_to(Linear(terms={1: 4}, constant=2))
+
+
+def test_linear_many_terms():
+    terms: dict[int, float | int] = {i: i + 1 for i in range(20)}
+    linear = Linear(terms=terms, constant=3)
+    assert {t.id: t.coefficient for t in linear.raw.terms} == terms
+    assert linear.raw.constant == 3
+
+
+def test_linear_invalid_id():
+    # Same error regardless of the number of terms
+    for n in [0, 20]:
+        terms: dict[int, float | int] = {i: 1 for i in range(n)}
+        terms[-1] = 1
+        with pytest.raises(ValueError):
+            Linear(terms=terms)
+    with pytest.raises(ValueError):
+        Linear.from_pairs([2**64], [1])
+
+
+def test_linear_almost_equal():
+    f = Linear(terms={1: 1, 2: 2}, constant=3)
+    assert f.almost_equal(Linear(terms={2: 2, 1: 1 + 1e-12}, constant=3))
+    assert f.almost_equal(Linear(terms={1: 1, 2: 2, 3: 0}, constant=3))
+    assert not f.almost_equal(Linear(terms={1: 1}, constant=3))
+    assert not f.almost_equal(Linear(terms={1: 1, 2: 2, 3: 1}, constant=3))
+    assert not f.almost_equal(Linear(terms={1: 1, 2: 2}, constant=3.1))
+    assert f.almost_equal(Linear(terms={1: 1, 2: 2}, constant=3.1), atol=0.2)
+
+
+def test_mul_zero():
+    x = DecisionVariable.binary(1)
+    zero = x * 0
+    assert zero.equals_to(Linear(terms={}))
+    assert (0 * (x + 2)).equals_to(Linear(terms={}))
+    # Results are independent objects
+    zero += 1
+    assert (x * 0).equals_to(Linear(terms={}))
+
+
+def test_mul_one():
+    f = 2 * DecisionVariable.binary(1) + 1
+    g = f * 1
+    assert g is not f
+    assert g.equals_to(f)
+    g += DecisionVariable.binary(2)
+    assert f.equals_to(Linear(terms={1: 2}, constant=1))
+
+
+def test_linear_evaluate():
+    x = DecisionVariable.binary(1)
+    y = DecisionVariable.binary(2)
+    f = 2 * x - y + 0.5
+    assert f.evaluate(State(entries={1: 1, 2: 1, 3: 0})) == (1.5, {1, 2})
+    assert f.evaluate({1: 1, 2: 1, 3: 0}) == (1.5, {1, 2})
+    # Mappings other than dict
+    assert f.evaluate(MappingProxyType({1: 1, 2: 1})) == (1.5, {1, 2})
+    assert f.evaluate(State(entries={1: 1, 2: 1}).entries) == (1.5, {1, 2})
+    with pytest.raises(RuntimeError):
+        f.evaluate(State(entries={1: 1}))
+
+
+def test_linear_evaluate_batch():
+    x = DecisionVariable.binary(1)
+    y = DecisionVariable.binary(2)
+    f = 2 * x - y + 0.5
+    states = [{1: 1, 2: 1}, State(entries={1: 0, 2: 1}), {1: 1, 2: 0}]
+    assert f.evaluate_batch(states) == [f.evaluate(s)[0] for s in states]
+    assert f.evaluate_batch([]) == []
+
+
+def test_decision_variable_compare_zero():
+    x = DecisionVariable.binary(1)
+    assert (x == 0).raw.function.linear == Linear(terms={1: 1}).raw
+    assert (x <= 0).raw.function.linear == Linear(terms={1: 1}).raw
+    assert (x >= 0).raw.function.linear == Linear(terms={1: -1}).raw
+
+
+def test_quadratic_evaluate():
+    f = Quadratic(
+        columns=[1, 2],
+        raws=[1, 3],
+        values=[2, -1],
+        linear=Linear(terms={2: 1}, constant=0.5),
+    )
+    assert f.evaluate({1: 2, 2: 1, 3: 4}) == (5.5, {1, 2, 3})
+    assert f.evaluate(State(entries={1: 2, 2: 1, 3: 4})) == (5.5, {1, 2, 3})
+    assert f.evaluate_batch(
+        [{1: 2, 2: 1, 3: 4}, State(entries={1: 0, 2: 2, 3: 1})]
+    ) == [
+        5.5,
+        0.5,
+    ]
+    with pytest.raises(RuntimeError):
+        f.evaluate({1: 2})
+
+
+def test_polynomial_evaluate():
+    f = Polynomial(coefficients=[([1, 2], 3), ([2, 2, 3], -1), ([], 0.5)])
+    assert f.evaluate({1: 2, 2: 1, 3: 4}) == (2.5, {1, 2, 3})
+    assert f.evaluate(State(entries={1: 2, 2: 1, 3: 4})) == (2.5, {1, 2, 3})
+    assert f.evaluate_batch([{1: 2, 2: 1, 3: 4}, {1: 0, 2: 2, 3: 1}]) == [2.5, -3.5]
+    assert f.evaluate(MappingProxyType({1: 2, 2: 1, 3: 4})) == (2.5, {1, 2, 3})
+    with pytest.raises(RuntimeError):
+        f.evaluate({1: 2})
+
+
+def test_sub():
+    x = DecisionVariable.binary(1)
+    y = DecisionVariable.binary(2)
+    assert (x - y).almost_equal(Linear(terms={1: 1, 2: -1}))
+    assert (x - x).almost_equal(Linear(terms={}))
+    assert (x - x).equals_to(x * 0)
+    assert (2 * x + 1 - (x + 3 * y + 2)).almost_equal(
+        Linear(terms={1: 1, 2: -3}, constant=-1)
+    )
+    assert (2 * x + y - y).almost_equal(Linear(terms={1: 2, 2: 0}))
+    assert (-(2 * x - y + 1)).almost_equal(Linear(terms={1: -2, 2: 1}, constant=-1))
+
+
+def test_linear_sum():
+    x = [DecisionVariable.binary(i) for i in range(20)]
+    operands = [(i % 3) * x[i % 7] + i for i in range(20)]
+    assert Linear.sum(operands).almost_equal(sum(operands, Linear(terms={})))
+    assert Linear.sum([]).equals_to(Linear(terms={}))
+    with pytest.raises(TypeError):
+        Linear.sum([Polynomial(coefficients=[([1, 2], 1)])])  # type: ignore
+
+
+def test_linear_add_disjoint():
+    x = [DecisionVariable.binary(i) for i in range(4)]
+    f = 2 * x[0] + 3 * x[1] + 1
+    g = f + x[2]
+    assert g.equals_to(Linear(terms={0: 2, 1: 3, 2: 1}, constant=1))
+    assert f.equals_to(Linear(terms={0: 2, 1: 3}, constant=1))
+    assert (f + (x[2] - x[3] + 2)).equals_to(
+        Linear(terms={0: 2, 1: 3, 2: 1, 3: -1}, constant=3)
+    )
+    # Overlapping IDs are merged
+    assert (f + x[0]).equals_to(Linear(terms={0: 3, 1: 3}, constant=1))
+    assert (f + (x[1] + x[2])).equals_to(Linear(terms={0: 2, 1: 4, 2: 1}, constant=1))
+
+
+def test_linear_add_scalar():
+    f = Linear(terms={1: 2}, constant=1)
+    assert (f + 2).equals_to(Linear(terms={1: 2}, constant=3))
+    assert (3 + f).equals_to(Linear(terms={1: 2}, constant=4))
+    g = f + 0
+    g += 1
+    # Operand is not modified
+    assert f.equals_to(Linear(terms={1: 2}, constant=1))
+
+
+def test_linear_mul_scalar():
+    f = Linear(terms={1: 2, 2: -1}, constant=1)
+    assert (f * 3).equals_to(Linear(terms={1: 6, 2: -3}, constant=3))
+    assert (-f).equals_to(Linear(terms={1: -2, 2: 1}, constant=-1))
+    # Operand is not modified
+    assert f.equals_to(Linear(terms={1: 2, 2: -1}, constant=1))
+
+
+def test_slots():
+    x = DecisionVariable.binary(1)
+    for obj in [
+        x,
+        x + 1,
+        Polynomial(coefficients=[([1], 1)]),
+        Quadratic(columns=[1], raws=[1], values=[1]),
+        x == 1,
+    ]:
+        assert not hasattr(obj, "__dict__")
+
+
+def test_polynomial_from_csr():
+    f = Polynomial.from_csr(
+        ids=numpy.array([1, 2, 3, 2], dtype=numpy.uint64),
+        offsets=numpy.array([0, 3, 3, 4]),
+        coefficients=numpy.array([2.0, 0.5, -1.0]),
+    )
+    assert f.raw == Polynomial(coefficients=[([1, 2, 3], 2), ([], 0.5), ([2], -1)]).raw
+    with pytest.raises(RuntimeError):
+        Polynomial.from_csr(ids=[1, 2], offsets=[0, 2], coefficients=[1, 2])
+    with pytest.raises(RuntimeError):
+        Polynomial.from_csr(ids=[1, 2], offsets=[0, 3], coefficients=[1])
+
+
+def test_linear_compare_scalar():
+    f = Linear(terms={1: 1, 2: 2}, constant=1)
+    assert (f == 3).raw.function.linear == Linear(terms={1: 1, 2: 2}, constant=-2).raw
+    assert (f <= 3).raw.function.linear == Linear(terms={1: 1, 2: 2}, constant=-2).raw
+    assert (f >= 3).raw.function.linear == Linear(terms={1: -1, 2: -2}, constant=2).raw
+    assert (3 >= f).raw.function.linear == Linear(terms={1: 1, 2: 2}, constant=-2).raw
+    # The left-hand side is not modified
+    assert f.equals_to(Linear(terms={1: 1, 2: 2}, constant=1))
+    # Duplicated IDs appended by `+=` are merged
+    f += Linear(terms={1: 1})
+    assert (f >= 3).raw.function.linear == Linear(terms={1: -2, 2: -2}, constant=2).raw
+    assert (f >= 3).raw.equality == Constraint.LESS_THAN_OR_EQUAL_TO_ZERO
@@ -0,0 +1,144 @@
+from types import MappingProxyType
+
+import pytest
+
+from ommx.v1 import Instance, DecisionVariable, Linear, Constraint
+from ommx.v1.constraint_pb2 import Constraint as _Constraint
+from ommx.v1.solution_pb2 import State
+
+
+def knapsack() -> Instance:
+    p = [10, 13, 18, 31, 7, 15]
+    w = [11, 15, 20, 35, 10, 33]
+    x = [DecisionVariable.binary(i) for i in range(6)]
+    return Instance.from_components(
+        decision_variables=x,
+        objective=sum(p[i] * x[i] for i in range(6)),
+        constraints=[Linear.from_pairs(range(6), w) <= 47],
+        sense=Instance.MAXIMIZE,
+    )
+
+
+def test_get_decision_variable():
+    instance = knapsack()
+    for i in range(6):
+        assert instance.get_decision_variable(i).id == i
+    with pytest.raises(ValueError):
+        instance.get_decision_variable(6)
+
+    # The index follows the modification of the raw message
+    del instance.raw.decision_variables[0]
+    instance.raw.decision_variables.append(DecisionVariable.binary(6).raw)
+    assert instance.get_decision_variable(6).id == 6
+    assert instance.get_decision_variable(1).id == 1
+    with pytest.raises(ValueError):
+        instance.get_decision_variable(0)
+
+
+def test_get_constraint():
+    instance = knapsack()
+    constraint_id = instance.raw.constraints[0].id
+    assert instance.get_constraint(constraint_id).raw is instance.raw.constraints[0]
+    # Lookup does not change IDs of new constraints
+    x = DecisionVariable.binary(1)
+    next_id = (x <= 1).raw.id + 1
+    instance.raw.constraints[0].id = next_id + 1000
+    instance.get_constraint(next_id + 1000)
+    assert (x <= 1).raw.id == next_id
+    with pytest.raises(ValueError):
+        instance.get_constraint(constraint_id + 1)
+
+
+def test_decision_variables_parameters():
+    x = [
+        DecisionVariable.binary(0),
+        DecisionVariable.binary(1, parameters={"a": "1"}),
+        DecisionVariable.binary(2, parameters={"b": "2"}),
+    ]
+    instance = Instance.from_components(
+        decision_variables=x, objective=0, constraints=[], sense=Instance.MINIMIZE
+    )
+    df = instance.decision_variables
+    assert df.columns.tolist()[-2:] == [("parameters", "a"), ("parameters", "b")]
+    assert df["parameters", "a"].isna().tolist() == [True, False, True]
+    assert df.loc[2, ("parameters", "b")] == "2"
+
+    # No parameters columns if no decision variable has parameters
+    df = knapsack().decision_variables
+    assert "parameters" not in df.columns.get_level_values(0)
+
+
+def test_empty_instance_tables():
+    instance = Instance.from_components(
+        decision_variables=[], objective=0, constraints=[], sense=Instance.MINIMIZE
+    )
+    assert instance.decision_variables.empty
+    assert "kind" in instance.decision_variables.columns.get_level_values(0)
+    assert instance.constraints.empty
+    assert "equality" in instance.constraints.columns.get_level_values(0)
+    # Numeric columns are typed even if empty
+    assert instance.decision_variables.index.dtype == "int64"
+    assert instance.decision_variables["lower"].dtype == "float64"
+
+
+def test_evaluate_batch():
+    instance = knapsack()
+    states = [State(entries={i: (i + k) % 2 for i in range(6)}) for k in range(3)]
+    solutions = instance.evaluate_batch(states)
+    assert [s.raw for s in solutions] == [instance.evaluate(s).raw for s in states]
+    assert instance.evaluate_batch([]) == []
+    # Plain mappings can be used as states
+    assert [
+        s.raw for s in instance.evaluate_batch([dict(s.entries) for s in states])
+    ] == [s.raw for s in solutions]
+    assert [
+        s.raw
+        for s in instance.evaluate_batch(
+            [MappingProxyType(dict(s.entries)) for s in states]
+        )
+    ] == [s.raw for s in solutions]
+
+
+def test_constraint_ids():
+    x = DecisionVariable.binary(1)
+    c1 = x == 1
+    c2 = x <= 1
+    assert c2.raw.id == c1.raw.id + 1
+    # IDs of new constraints follow the wrapped one
+    Constraint.from_raw(_Constraint(id=c2.raw.id + 100))
+    assert (x >= 0).raw.id == c2.raw.id + 101
+    # Wrapping a smaller ID does not skip IDs
+    Constraint.from_raw(_Constraint(id=0))
+    assert (x >= 0).raw.id == c2.raw.id + 102
+
+
+def test_large_ids():
+    x = DecisionVariable.binary(2**63 + 5)
+    instance = Instance.from_components(
+        decision_variables=[x],
+        objective=x,
+        constraints=[
+            _Constraint(
+                id=2**64 - 1,
+                function=(x <= 1).raw.function,
+                equality=Constraint.LESS_THAN_OR_EQUAL_TO_ZERO,
+            )
+        ],
+        sense=Instance.MAXIMIZE,
+    )
+    assert instance.decision_variables.index.tolist() == [2**63 + 5]
+    assert instance.constraints.index.tolist() == [2**64 - 1]
+    solution = instance.evaluate(State(entries={2**63 + 5: 1}))
+    assert solution.constraints.index.tolist() == [2**64 - 1]
+    assert solution.decision_variables.index.tolist() == [2**63 + 5]
+
+
+def test_evaluate_objectives():
+    instance = knapsack()
+    states = [State(entries={i: (i + k) % 2 for i in range(6)}) for k in range(3)]
+    df = instance.evaluate_objectives(states)
+    solutions = instance.evaluate_batch(states)
+    assert df["objective"].tolist() == [s.raw.objective for s in solutions]
+    assert df["feasible"].tolist() == [s.raw.feasible for s in solutions]
+    assert df["objective"].dtype == "float64"
+    assert df["feasible"].dtype == "bool"